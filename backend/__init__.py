@@ -1,12 +1,68 @@
+import io
 import os
-import glob
+import copy
+import fnmatch
+import hashlib
+import re
 import shutil
-import tempfile
+import tarfile
 import subprocess
+import threading
+import time
 import typing
+from concurrent.futures import ThreadPoolExecutor
+
+
+_MOUNT_DIR = '/workspace'
+
+
+def _dockerignore_patterns(df_path: str, context_dir: str) -> list[tuple[bool, re.Pattern]]:
+    '''
+        Parsed ignore rules as (negated, regex). Like BuildKit, `<Dockerfile>.dockerignore` next to the
+        Dockerfile takes precedence over `.dockerignore` at the context root.
+    '''
+
+    for path in (df_path + '.dockerignore', os.path.join(context_dir, '.dockerignore')):
+        if os.path.exists(path):
+            break
+    else:
+        return []
+
+    patterns: list[tuple[bool, re.Pattern]] = []
+    with open(path, 'r', encoding='utf-8') as fh:
+        for line in fh:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            line = os.path.normpath(line.lstrip('!').strip()).lstrip('/')
+            # `**` spans directories; `*`/`?` stay within one path component.
+            regex = ''.join(
+                '(?:.*/)?' if tok == '**/' else '.*' if tok == '**' else '[^/]*' if tok == '*'
+                else '[^/]' if tok == '?' else re.escape(tok)
+                for tok in re.split(r'(\*\*/|\*\*|\*|\?)', line) if tok
+            )
+            patterns.append((negated, re.compile(regex)))
+    return patterns
+
+
+def _is_dockerignored(rel: str, patterns: list[tuple[bool, re.Pattern]]) -> bool:
+    # A rule matching a parent directory excludes (or re-includes) everything below it; the last match wins.
+    parts = rel.split('/')
+    candidates = ['/'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+    ignored = False
+    for negated, regex in patterns:
+        if any(regex.fullmatch(c) for c in candidates):
+            ignored = not negated
+    return ignored
 
 
 class BaseRenderer:
+    # Long-lived worker containers (image tag -> container id), shared by all renderers in the process.
+    _containers: dict[str, str] = {}
+    # Serializes image/container setup when several renders run in parallel.
+    _docker_lock = threading.Lock()
+
     def __init__(
         self,
         data: dict,
@@ -21,6 +77,7 @@ class BaseRenderer:
         config_hash: str | None = None,
         exclude_projects: typing.Iterable[str] | None = None,
         root_dir: str | None = None,
+        dump_intermediate: bool = False,
     ):
         self.data = data or {}
         self.labels = labels or {}
@@ -34,24 +91,183 @@ class BaseRenderer:
         self.config_hash = config_hash
         self.exclude_projects = [str(x) for x in (exclude_projects or [])]
         self.root_dir = root_dir
+        self.dump_intermediate = dump_intermediate
+        self._image_tag: str | None = None
 
     def render(self) -> str:
         raise NotImplementedError('Subclasses should implement this method.')
 
+    @staticmethod
+    def lang_token(language: str | None) -> str:
+        return str(language or 'en').replace('_', '-').split('-')[0].lower() or 'en'
+
+    def with_language(self, language: str) -> 'BaseRenderer':
+        clone = copy.copy(self)
+        clone.language = language or 'en'
+        return clone
+
+    def render_many(self, languages: list[str]) -> list[str]:
+        '''
+            Render every language in parallel (TeX is single-threaded and CPU-bound) through the shared worker
+            container. Returns output paths in the order of languages.
+        '''
+
+        # Languages sharing a token (`en`, `en_US`) share a workspace dir and output stem: render each once.
+        unique: dict[str, str] = {}
+        for l in languages:
+            unique.setdefault(self.lang_token(l), l)
+        renderers = [self.with_language(l) for l in unique.values()]
+        with ThreadPoolExecutor(max_workers=max(min(len(renderers), os.cpu_count() or 1), 1)) as pool:
+            paths = dict(zip(unique, pool.map(lambda r: r.render(), renderers)))
+        return [paths[self.lang_token(l)] for l in languages]
+
+    def _resolve_image_tag(self, df_path: str, context_dir: str) -> str:
+        '''
+            Image tag derived from basename plus a hash of the `Dockerfile` and the build context files not
+            excluded by `.dockerignore` (paths, mtimes and sizes). Computed once per renderer instance.
+        '''
+
+        if self._image_tag is None:
+            h = hashlib.sha256()
+            with open(df_path, 'rb') as fh:
+                h.update(fh.read())
+            ignore = _dockerignore_patterns(df_path, context_dir)
+            for root, dirs, files in os.walk(context_dir):
+                # Bytecode caches churn on every import and never end up in the image.
+                dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+                for fname in sorted(files):
+                    full = os.path.join(root, fname)
+                    if _is_dockerignored(os.path.relpath(full, context_dir).replace(os.sep, '/'), ignore):
+                        continue
+                    st = os.stat(full)
+                    h.update(f'{os.path.relpath(full, context_dir)}\0{st.st_mtime_ns}\0{st.st_size}\n'.encode('utf-8'))
+
+            base = (self.basename or 'cv').lower()
+            safe = ''.join(ch if ch.isalnum() or ch in '-._' else '-' for ch in base).strip('-.')
+            self._image_tag = f"{safe or 'cv'}:{h.hexdigest()[:12]}"
+        return self._image_tag
+
+    def _ensure_image(self, df_path: str, context_dir: str) -> tuple[str, bytes, bytes]:
+        '''
+            Make sure the image for the current build inputs is available locally, building it only when
+            neither the local daemon nor the registry has it. Returns (image_tag, build_stdout, build_stderr).
+        '''
+
+        image_tag = self._resolve_image_tag(df_path, context_dir)
+
+        inspect_cmd = ['docker', 'image', 'inspect', image_tag]
+        if subprocess.run(inspect_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0:
+            return image_tag, b'', b''
+
+        env = {**os.environ, 'DOCKER_BUILDKIT': '1'}
+        pull_cmd = ['docker', 'pull', image_tag]
+        if subprocess.run(pull_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env).returncode == 0:
+            return image_tag, b'', b''
+
+        # Build image with BuildKit, reusing layers from a previously pushed image via inline cache.
+        build_cmd = [
+            'docker', 'buildx', 'build', '--load',
+            '-t', image_tag,
+            '--cache-from', f'type=registry,ref={image_tag}',
+            '--cache-to', 'type=inline',
+            '--build-arg', 'BUILDKIT_INLINE_CACHE=1',
+            '-f', df_path,
+            context_dir,
+        ]
+        # Output stays bytes: it is only ever read on failure, so decode lazily.
+        build_proc = subprocess.run(build_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+        if build_proc.returncode != 0:
+            out = build_proc.stdout.decode('utf-8', errors='replace')
+            err = build_proc.stderr.decode('utf-8', errors='replace')
+            raise RuntimeError(f'Docker build failed (code {build_proc.returncode}).\nSTDOUT:\n{out}\nSTDERR:\n{err}')
+        return image_tag, build_proc.stdout, build_proc.stderr
+
+    def _ensure_container(self, image_tag: str) -> str:
+        '''
+            Start (or reuse) a detached worker container for image_tag with a named volume mounted at /workspace,
+            so TeX auxiliary files survive between renders. Returns the container id.
+        '''
+
+        cid = BaseRenderer._containers.get(image_tag)
+        if cid:
+            return cid
+
+        safe = image_tag.replace(':', '-')
+        name = f'cv-worker-{safe}'
+        inspect_cmd = ['docker', 'container', 'inspect', '-f', '{{.Id}} {{.State.Running}}', name]
+        inspect_proc = subprocess.run(inspect_cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        if inspect_proc.returncode == 0:
+            cid, running = inspect_proc.stdout.split()
+            if running != 'true':
+                start_proc = subprocess.run(['docker', 'start', cid], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+                if start_proc.returncode != 0:
+                    raise RuntimeError(
+                        f'Docker start failed (code {start_proc.returncode}).\nSTDOUT:\n{start_proc.stdout}\nSTDERR:\n{start_proc.stderr}'
+                    )
+        else:
+            self._remove_stale_workers(image_tag)
+            run_cmd = [
+                'docker', 'run', '-d',
+                '--name', name,
+                '-v', f'cv-work-{safe}:{_MOUNT_DIR}',
+                '-w', _MOUNT_DIR,
+                '--entrypoint', 'sleep',
+                image_tag,
+                'infinity',
+            ]
+            run_proc = subprocess.run(run_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            if run_proc.returncode != 0:
+                raise RuntimeError(
+                    f'Docker run failed (code {run_proc.returncode}).\nSTDOUT:\n{run_proc.stdout}\nSTDERR:\n{run_proc.stderr}'
+                )
+            cid = run_proc.stdout.strip()
+
+        BaseRenderer._containers[image_tag] = cid
+        return cid
+
+    def _remove_stale_workers(self, image_tag: str) -> None:
+        '''
+            Best effort: drop workers (and their workspace volumes) left over from earlier image tags of the same
+            basename, so changing build inputs doesn't leave `sleep infinity` containers behind.
+        '''
+
+        base, _, _ = image_tag.partition(':')
+        current = f"cv-worker-{image_tag.replace(':', '-')}"
+        pattern = re.compile(f'cv-worker-{re.escape(base)}-[0-9a-f]{{12}}')
+        ps_cmd = ['docker', 'ps', '-a', '--filter', f'name=cv-worker-{base}-', '--format', '{{.Names}}']
+        ps_proc = subprocess.run(ps_cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        stale = [n for n in ps_proc.stdout.split() if pattern.fullmatch(n) and n != current]
+        if not stale:
+            return
+        subprocess.run(['docker', 'rm', '-f', *stale], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        volumes = ['cv-work-' + n[len('cv-worker-') :] for n in stale]
+        subprocess.run(['docker', 'volume', 'rm', *volumes], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def _copy_into_container(self, cid: str, archive: bytes, dest: str = _MOUNT_DIR) -> None:
+        copy_cmd = ['docker', 'cp', '-', f'{cid}:{dest}']
+        copy_proc = subprocess.run(copy_cmd, input=archive, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if copy_proc.returncode != 0:
+            out, err = copy_proc.stdout.decode('utf-8', errors='replace'), copy_proc.stderr.decode('utf-8', errors='replace')
+            raise RuntimeError(f'Docker cp failed (code {copy_proc.returncode}).\nSTDOUT:\n{out}\nSTDERR:\n{err}')
+
     def run_in_docker(
         self,
         cmd: str | list[str],
         files: dict[str, typing.Any],
         outputs: list[str],
+        archive: bytes | None = None,
+        workdir: str | None = None,
     ) -> dict[str, typing.Any]:
         '''
-            Build image from self.dockerfile, run cmd with provided files in a temp workspace,
-            and collect specified outputs.
+            Build image from self.dockerfile, run cmd with provided files in the persistent workspace of
+            a long-lived worker container, and collect specified outputs.
 
             - cmd: shell string or argv list executed in the container.
             - files: mapping of relative paths -> content (str|bytes). Directories are created automatically.
-            - outputs: list of file or glob patterns relative to the workspace (or starting with /workspace).
-            Returns dict with stdout, stderr, outputs (bytes), image, returncode, build logs.
+            - outputs: list of file or glob patterns relative to the working dir (or absolute paths inside it).
+            - archive: optional ready-made tar blob extracted into the working dir alongside files.
+            - workdir: optional subdirectory of /workspace to use as working dir, so parallel renders don't collide.
+            Returns dict with stdout, stderr, outputs, build logs (all bytes), image, returncode.
         '''
 
         if not shutil.which('docker'):
@@ -64,79 +280,88 @@ class BaseRenderer:
         # Build context = directory of `Dockerfile`.
         context_dir = os.path.dirname(df_path) or '.'
 
-        # Internal image tag (derived from basename).
-        base = (self.basename or 'cv').lower()
-        safe = ''.join(ch if ch.isalnum() or ch in '-._' else '-' for ch in base).strip('-.')
-        image_tag = f"{safe or 'cv'}:latest"
+        with BaseRenderer._docker_lock:
+            image_tag, build_stdout, build_stderr = self._ensure_image(df_path, context_dir)
+            cid = self._ensure_container(image_tag)
 
-        # Build image.
-        build_cmd = ['docker', 'build', '-t', image_tag, '-f', df_path, context_dir]
-        build_proc = subprocess.run(build_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        if build_proc.returncode != 0:
-            raise RuntimeError(
-                f'Docker build failed (code {build_proc.returncode}).\nSTDOUT:\n{build_proc.stdout}\nSTDERR:\n{build_proc.stderr}'
-            )
+        workdir = str(workdir or '').strip('/').replace('\\', '/')
+        work_dir = f'{_MOUNT_DIR}/{workdir}' if workdir else _MOUNT_DIR
+
+        # Stream inputs into the workspace as tar archives: one `docker cp` each instead of a write per file.
+        # Files go first with prefixed names, which also creates the working dir for the archive copy.
+        if files or workdir:
+            buf = io.BytesIO()
+            with tarfile.open(fileobj=buf, mode='w') as tar:
+                if workdir:
+                    info = tarfile.TarInfo(workdir)
+                    info.type = tarfile.DIRTYPE
+                    info.mtime = int(time.time())
+                    info.mode = 0o755
+                    tar.addfile(info)
+                for rel, content in (files or {}).items():
+                    rel = str(rel).lstrip('/').replace('\\', '/')
+                    rel = f'{workdir}/{rel}' if workdir else rel
+                    if isinstance(content, bytes):
+                        data = content
+                    else:
+                        data = ('' if content is None else str(content)).encode('utf-8')
+                    info = tarfile.TarInfo(rel)
+                    info.size = len(data)
+                    info.mtime = int(time.time())
+                    info.mode = 0o644
+                    tar.addfile(info, io.BytesIO(data))
+            self._copy_into_container(cid, buf.getvalue())
+        if archive:
+            self._copy_into_container(cid, archive, work_dir)
+
+        # Run command in the worker container inside its working dir.
+        exec_cmd: list[str] = ['docker', 'exec', '-w', work_dir, cid]
+        if isinstance(cmd, str):
+            exec_cmd += ['/bin/sh', '-lc', cmd]
+        else:
+            exec_cmd += list(cmd)
 
-        mount_dir = '/workspace'
-
-        with tempfile.TemporaryDirectory(prefix='cv-work-') as tmpdir:
-            # Materialize input files into temp workspace.
-            for rel, content in (files or {}).items():
-                rel = str(rel).lstrip('/').replace('\\', '/')
-                host_path = os.path.join(tmpdir, rel)
-                os.makedirs(os.path.dirname(host_path), exist_ok=True)
-                if isinstance(content, bytes):
-                    with open(host_path, 'wb') as fh:
-                        fh.write(content)
-                else:
-                    with open(host_path, 'w', encoding='utf-8') as fh:
-                        fh.write('' if content is None else str(content))
-
-            # Run container; mount tmpdir at /workspace and set it as working dir.
-            run_cmd: list[str] = ['docker', 'run', '--rm', '-v', f'{tmpdir}:{mount_dir}', '-w', mount_dir, image_tag]
-            if isinstance(cmd, str):
-                run_cmd += ['/bin/sh', '-lc', cmd]
+        run_proc = subprocess.run(exec_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if run_proc.returncode != 0:
+            out = run_proc.stdout.decode('utf-8', errors='replace')
+            err = run_proc.stderr.decode('utf-8', errors='replace')
+            raise RuntimeError(f'Docker exec failed (code {run_proc.returncode}).\nSTDOUT:\n{out}\nSTDERR:\n{err}')
+
+        # Collect outputs: stream the working dir out as a single tar and pick matching members in memory.
+        patterns: list[str] = []
+        for pattern in outputs or []:
+            if pattern.startswith(work_dir + '/'):
+                patterns.append(pattern[len(work_dir) + 1 :])
+            elif pattern.startswith('/'):
+                # Outside the working dir; cannot collect.
+                continue
             else:
-                run_cmd += list(cmd)
+                patterns.append(pattern)
 
-            run_proc = subprocess.run(run_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            if run_proc.returncode != 0:
-                raise RuntimeError(
-                    f'Docker run failed (code {run_proc.returncode}).\nSTDOUT:\n{run_proc.stdout}\nSTDERR:\n{run_proc.stderr}'
-                )
+        collected: dict[str, bytes] = {}
+        if patterns:
+            copy_cmd = ['docker', 'cp', f'{cid}:{work_dir}/.', '-']
+            copy_proc = subprocess.run(copy_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            if copy_proc.returncode != 0:
+                err = copy_proc.stderr.decode('utf-8', errors='replace')
+                raise RuntimeError(f'Docker cp failed (code {copy_proc.returncode}).\nSTDERR:\n{err}')
+            with tarfile.open(fileobj=io.BytesIO(copy_proc.stdout)) as tar:
+                for member in tar:
+                    if not member.isfile():
+                        continue
+                    relp = os.path.normpath(member.name)
+                    # A pattern matching a directory collects everything below it.
+                    parts = relp.split('/')
+                    candidates = ['/'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+                    if any(fnmatch.fnmatchcase(c, pat) for pat in patterns for c in candidates):
+                        collected[relp] = tar.extractfile(member).read()
 
-            # Collect outputs from the mounted workspace.
-            collected: dict[str, bytes] = {}
-            for pattern in outputs or []:
-                if pattern.startswith(mount_dir + '/'):
-                    rel_pattern = pattern[len(mount_dir) + 1 :]
-                elif pattern.startswith('/'):
-                    # Outside mounted volume; cannot collect.
-                    continue
-                else:
-                    rel_pattern = pattern
-
-                host_pattern = os.path.join(tmpdir, rel_pattern)
-                matches = glob.glob(host_pattern, recursive=True)
-                for m in matches:
-                    if os.path.isdir(m):
-                        for root, _dirs, files_in_dir in os.walk(m):
-                            for f in files_in_dir:
-                                p = os.path.join(root, f)
-                                relp = os.path.relpath(p, tmpdir)
-                                with open(p, 'rb') as fh:
-                                    collected[relp] = fh.read()
-                    else:
-                        relp = os.path.relpath(m, tmpdir)
-                        with open(m, 'rb') as fh:
-                            collected[relp] = fh.read()
-
-            return {
-                'stdout': run_proc.stdout,
-                'stderr': run_proc.stderr,
-                'outputs': collected,
-                'image': image_tag,
-                'returncode': run_proc.returncode,
-                'build_stdout': build_proc.stdout,
-                'build_stderr': build_proc.stderr,
-            }
+        return {
+            'stdout': run_proc.stdout,
+            'stderr': run_proc.stderr,
+            'outputs': collected,
+            'image': image_tag,
+            'returncode': run_proc.returncode,
+            'build_stdout': build_stdout,
+            'build_stderr': build_stderr,
+        }
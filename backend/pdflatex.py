@@ -1,13 +1,231 @@
+import io
 import os
 import re
 import datetime
+import functools
+import tarfile
+import json
 import typing
-from jinja2 import Environment, FileSystemLoader
+from concurrent.futures import ThreadPoolExecutor
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, pass_context
+
+try:
+    import orjson
+except ImportError:  # Optional: only speeds up `--dump-intermediate`.
+    orjson = None
 
 import backend
 
 
+_ONGOING = frozenset({'', 'now', 'present', 'current', 'ongoing'})
+_LOCALES = {'en': 'en_US', 'ru': 'ru_RU', 'pl': 'pl_PL'}
+
+
+class _AttrDict(dict):
+    '''
+        Dict that is its own `__dict__`: Jinja's `obj.key` resolves through plain attribute lookup instead of
+        failing `getattr` and falling back to `obj['key']`. A key shadows a dict method of the same name, so it is
+        only used for fixed-schema records (see `_USER_KEYED`).
+    '''
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any):
+        super().__init__(*args, **kwargs)
+        self.__dict__ = self
+
+
+# Mappings whose keys come from user data (and whose `.items()`/`.get()` the template calls); kept as plain dicts.
+_USER_KEYED = frozenset({'links', 'contacts', 'contact', 'environment', 'labels'})
+
+
+def _attr_tree(v: typing.Any) -> typing.Any:
+    if isinstance(v, dict):
+        return _AttrDict((k, x if k in _USER_KEYED else _attr_tree(x)) for k, x in v.items())
+    if isinstance(v, list):
+        return [_attr_tree(x) for x in v]
+    return v
+
+
+def _dump_json(obj: typing.Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _scan_tree(root: str) -> typing.Iterator[os.DirEntry]:
+    '''
+        All entries below root, depth-first. `scandir` entries carry the file type from the directory listing,
+        so telling files from directories costs no extra `stat` (unlike `os.walk`).
+    '''
+
+    with os.scandir(root) as it:
+        for entry in it:
+            yield entry
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_tree(entry.path)
+
+
+# Fixed-shape `YYYY-MM` / `YYYY` checks; `isdecimal` accepts exactly what `\d` does, without a regex call.
+def _is_ym(s: str) -> bool:
+    return len(s) == 7 and s[4] == '-' and s[:4].isdecimal() and s[5:].isdecimal()
+
+
+def _is_y(s: str) -> bool:
+    return len(s) == 4 and s.isdecimal()
+
+
+# LaTeX special characters in plain text: & % $ # _ { } plus `~`/`^` (active in text mode) and backslash.
+_TEX_TABLE = str.maketrans({
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+})
+
+
+# Escape LaTeX special characters in plain text (not for content containing LaTeX macros).
+def _tex_escape(value: typing.Any) -> str:
+    return '' if value is None else str(value).translate(_TEX_TABLE)
+
+
+# Format dates into localized labels like "Oct 2025" (or "окт 2025").
+# Month names are read from labels.months_short (a 12-item list localized to current language).
+@pass_context
+def _fmt_ym_label(ctx: typing.Any, value: typing.Any, l: typing.Any) -> str:
+    if value is None:
+        return ''
+    s = str(value).strip()
+    if not s:
+        return ''
+
+    # Prefer labels.months_short (already localized to the current language via expand_intermediate)
+    months_list = (ctx.get('labels') or {}).get('months_short')
+    # `YYYY-MM`.
+    if _is_ym(s):
+        y = int(s[:4])
+        mm = int(s[5:])
+        if not (isinstance(months_list, (list, tuple)) and len(months_list) == 12):
+            return s
+        name = months_list[max(min(mm, 12), 1) - 1]
+        return f'{name} {y}'
+    # `YYYY`
+    if _is_y(s):
+        return s
+    # Try ISO date.
+    try:
+        d = datetime.date.fromisoformat(s)
+        if not (isinstance(months_list, (list, tuple)) and len(months_list) == 12):
+            return s
+        name = months_list[d.month - 1]
+        return f'{name} {d.year}'
+    except Exception:
+        return s
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date(s: typing.Any) -> datetime.date | None:
+    if s is None:
+        return None
+    s = str(s).strip()
+    if s.lower() in _ONGOING:
+        return None
+    try:
+        if _is_ym(s):
+            return datetime.date(int(s[:4]), int(s[5:]), 1)
+        if _is_y(s):
+            return datetime.date(int(s), 1, 1)
+        return datetime.date.fromisoformat(s)
+    except Exception:
+        return None
+
+
 class Renderer(backend.BaseRenderer):
+    # Tarballs of template assets keyed by (template_dir, newest mtime), reused across renders/languages.
+    _template_archives: dict[tuple[str, float], bytes] = {}
+
+    # Compiled templates keyed by (template_dir, template_name, mtime), reused across renders/languages.
+    _templates: dict[tuple[str, str, float], Template] = {}
+
+    @classmethod
+    def _load_template(cls, template_dir: str, name: str) -> Template:
+        '''
+            Compiled Jinja template, rebuilt only when the template file changes. Compiled bytecode is also
+            cached on disk (per user), so fresh processes skip recompiling an unchanged template.
+        '''
+
+        key = (template_dir, name, os.stat(os.path.join(template_dir, name)).st_mtime)
+        template = cls._templates.get(key)
+        if template is None:
+            env = Environment(
+                loader=FileSystemLoader(template_dir),
+                autoescape=False,
+                trim_blocks=True,
+                lstrip_blocks=True,
+                # Default location is a per-user, 0700, ownership-checked `_jinja2-cache-<uid>` dir.
+                bytecode_cache=FileSystemBytecodeCache(),
+                # Freshness is tracked by the cache key above, so Jinja needn't re-stat sources on every lookup.
+                auto_reload=False,
+                cache_size=-1,
+                optimized=True,
+            )
+            env.filters['fmt_ym'] = _fmt_ym_label
+            env.filters['tex_escape'] = _tex_escape
+            template = cls._templates[key] = env.get_template(name)
+        return template
+
+    @classmethod
+    def _template_archive(cls, template_dir: str) -> bytes:
+        '''
+            Tar of everything in template_dir except Jinja sources and `main.tex`, built once per template state.
+        '''
+
+        entries: list[tuple[str, str]] = []
+        newest = os.stat(template_dir).st_mtime
+        for entry in _scan_tree(template_dir):
+            if entry.is_dir(follow_symlinks=False):
+                # Directory mtimes change on add/remove, so deletions invalidate the cache too.
+                newest = max(newest, entry.stat(follow_symlinks=False).st_mtime)
+                continue
+            if not entry.is_file():
+                continue
+            rel = os.path.relpath(entry.path, template_dir)
+            if rel.endswith('.j2') or rel == 'main.tex':
+                continue
+            newest = max(newest, entry.stat().st_mtime)
+            entries.append((entry.path, rel))
+
+        key = (template_dir, newest)
+        archive = cls._template_archives.get(key)
+        if archive is None:
+            paths = [full for full, _rel in entries]
+            # Reads release the GIL, so threads overlap I/O latency; not worth the pool for a handful of files.
+            if len(paths) > 20:
+                with ThreadPoolExecutor(max_workers=8) as pool:
+                    contents = list(pool.map(_read_bytes, paths))
+            else:
+                contents = [_read_bytes(p) for p in paths]
+
+            buf = io.BytesIO()
+            # Dereference, so symlinked assets arrive in the container as regular files.
+            with tarfile.open(fileobj=buf, mode='w', dereference=True) as tar:
+                for (full, rel), data in zip(entries, contents):
+                    info = tar.gettarinfo(full, arcname=rel.replace(os.sep, '/'))
+                    info.size = len(data)
+                    tar.addfile(info, io.BytesIO(data))
+            # Empty blob when there are no assets, so callers can skip the copy altogether.
+            archive = cls._template_archives[key] = buf.getvalue() if entries else b''
+        return archive
+
     def expand_intermediate(self) -> dict:
         # See example of intermediate format in `intermediate.example.yaml`. No schema, womp-womp.
 
@@ -22,41 +240,19 @@ class Renderer(backend.BaseRenderer):
 
         today = datetime.date.today()
 
-        def _to_locale(l: str) -> str:
-            m = {'en': 'en_US', 'ru': 'ru_RU', 'pl': 'pl_PL'}
-            return m.get(l, 'en_US')
-
         def tr(v: typing.Any) -> typing.Any:
             if isinstance(v, dict):
-                # Prefer exact two-letter language match.
+                # Prefer exact two-letter language match, then English.
                 if lang in v:
                     return v[lang]
                 if 'en' in v:
                     return v['en']
-                for _, val in v.items():
-                    return val
-                return None
+                return next(iter(v.values()), None)
             return v
 
         def tr_list(items: typing.Any) -> list[str]:
             return [str(tr(x)) for x in (items or [])]
 
-        def _parse_date(s: typing.Any) -> datetime.date | None:
-            if s is None:
-                return None
-            s = str(s).strip()
-            if not s or s.lower() in {'now', 'present', 'current', 'ongoing'}:
-                return None
-            try:
-                if re.fullmatch('\\d{4}-\\d{2}', s):
-                    y, m = s.split('-')
-                    return datetime.date(int(y), int(m), 1)
-                if re.fullmatch('\\d{4}', s):
-                    return datetime.date(int(s), 1, 1)
-                return datetime.date.fromisoformat(s)
-            except Exception:
-                return None
-
         def _fmt_ym(d: datetime.date | None) -> str | None:
             return f'{d.year:04d}-{d.month:02d}' if d else None
 
@@ -66,7 +262,8 @@ class Renderer(backend.BaseRenderer):
             months = (b.year - a.year) * 12 + (b.month - a.month)
             return max(months - (1 if b.day < a.day else 0), 0)
 
-        environment = dict(getattr(self, 'environment', {}) or {})
+        # Already copied in `BaseRenderer.__init__`; the intermediate is read-only from here on.
+        environment = getattr(self, 'environment', None) or {}
 
         # Person.
         p_raw = raw.get('person') or {}
@@ -74,7 +271,7 @@ class Renderer(backend.BaseRenderer):
             'name': tr(p_raw.get('name')),
             'title': tr(p_raw.get('title')),
             'location': tr(p_raw.get('location')),
-            'contacts': dict(p_raw.get('contacts') or {}),
+            'contacts': p_raw.get('contacts') or {},
             'summary': tr(p_raw.get('summary')),
         }
 
@@ -84,21 +281,30 @@ class Renderer(backend.BaseRenderer):
         skills_raw = raw.get('skills') or {}
         registry: dict[str, dict] = skills_raw.get('registry') or {}
         groups_raw: list[dict] = skills_raw.get('groups') or []
-        skills: list[dict] = []
-        for g in groups_raw:
-            items_out: list[dict] = []
-            for sid in (g.get('items') or []):
-                meta = registry.get(str(sid)) or {}
-                items_out.append({
+        # Translated once per registry entry; shared by skill groups and every project's skill list.
+        skill_meta: dict[str, dict] = {
+            str(sid): {'name': tr((m or {}).get('name') or sid), 'level': (m or {}).get('level')}
+            for sid, m in registry.items()
+        }
+
+        def _skill_items_from_ids(ids: list[str]) -> list[dict]:
+            out: list[dict] = []
+            for sid in (ids or []):
+                meta = skill_meta.get(str(sid))
+                out.append({
                     'id': sid,
-                    'name': tr(meta.get('name') or sid),
-                    'level': meta.get('level'),
+                    'name': meta['name'] if meta else sid,
+                    'level': meta['level'] if meta else None,
                     'highlight': False,
                 })
+            return out
+
+        skills: list[dict] = []
+        for g in groups_raw:
             skills.append({
                 'id': g.get('id'),
                 'group': tr(g.get('name') or g.get('id')),
-                'items': items_out,
+                'items': _skill_items_from_ids(g.get('items')),
             })
 
         # Spoken languages.
@@ -113,23 +319,11 @@ class Renderer(backend.BaseRenderer):
         # Projects grouped by employer.
         projects_raw: dict[str, dict] = raw.get('projects') or {}
         # Optionally exclude some projects by ID based on configuration.
-        exclude_projects: set[str] = set([str(x) for x in (getattr(self, 'exclude_projects', []) or [])])
+        exclude_projects: set[str] = {str(x) for x in (getattr(self, 'exclude_projects', []) or [])}
         by_employer: dict[str, list[dict]] = {}
 
-        # Accumulate per-skill usage across projects.
-        skill_stats: dict[str, dict] = {}
-
-        def _skill_items_from_ids(ids: list[str]) -> list[dict]:
-            out: list[dict] = []
-            for sid in (ids or []):
-                meta = registry.get(str(sid)) or {}
-                out.append({
-                    'id': sid,
-                    'name': tr(meta.get('name') or sid),
-                    'level': meta.get('level'),
-                    'highlight': False,
-                })
-            return out
+        # Per-skill usage events across projects: (months, first, last); reduced once after the loop.
+        skill_events: dict[str, list[tuple[int, datetime.date | None, datetime.date]]] = {}
 
         for pid, pr in (projects_raw or {}).items():
             if pid in exclude_projects:
@@ -152,18 +346,16 @@ class Renderer(backend.BaseRenderer):
                 'summary': tr(pr.get('summary')),
                 'responsibilities': tr_list(pr.get('responsibilities')),
                 'skills': _skill_items_from_ids(list(pr.get('skills') or [])),
-                'links': dict(pr.get('links') or {}),
+                'links': pr.get('links') or {},
                 'contributions': [],
+                # Month-precision spans (as rendered in `start`/`end`) for the employer pass; stripped before return.
+                '_ps': ps.replace(day=1) if ps else None,
+                '_pe': None if ongoing else pe_raw.replace(day=1),
             }
             # Accumulate skill usage for this project's skills.
+            event = (pr_months, ps, pe_for_duration)
             for sid in (pr.get('skills') or []):
-                st = skill_stats.setdefault(str(sid), {'months': 0, 'first': None, 'last': None})
-                st['months'] = int(st.get('months', 0)) + int(pr_months)
-                if ps:
-                    st['first'] = ps if (st['first'] is None or ps < st['first']) else st['first']
-                end_for_last = pe_raw or today
-                if end_for_last:
-                    st['last'] = end_for_last if (st['last'] is None or end_for_last > st['last']) else st['last']
+                skill_events.setdefault(str(sid), []).append(event)
 
             for cid in (pr.get('contributions') or []):
                 meta = contrib_reg.get(str(cid)) or {}
@@ -174,26 +366,41 @@ class Renderer(backend.BaseRenderer):
                 })
             by_employer.setdefault(emp_key, []).append(entry)
 
-        # Employers -> experience.
+        skill_stats: dict[str, dict] = {}
+        for sid, evs in skill_events.items():
+            skill_stats[sid] = {
+                'months': sum(e[0] for e in evs),
+                'first': min((e[1] for e in evs if e[1]), default=None),
+                'last': max((e[2] for e in evs), default=None),
+            }
+
+        # Employers -> experience. Also collects overall spans, so metrics need no separate pass.
         employers_raw: dict[str, dict] = raw.get('employers') or {}
         experience: list[dict] = []
+        span_starts: list[datetime.date] = []
+        span_ends: list[datetime.date] = []
+        total_projects = 0
         for ekey, emp in employers_raw.items():
             projects = by_employer.get(ekey, [])
             if not projects:
                 continue
 
-            start_dates = [_parse_date(p.get('start')) for p in projects if p.get('start')]
-            end_dates_raw = [_parse_date(p.get('end')) for p in projects if p.get('end')]
-            any_ongoing = any(p.get('end') in (None, '',) for p in projects)
-
-            emp_start = min([d for d in start_dates if d]) if start_dates else None
-            if any_ongoing or not end_dates_raw:
-                emp_end = None
-                end_for_duration = today
-            else:
-                filtered = [d for d in end_dates_raw if d]
-                emp_end = max(filtered) if filtered else None
-                end_for_duration = emp_end or today
+            starts = [p['_ps'] for p in projects if p['_ps']]
+            ends = [p['_pe'] for p in projects]
+            emp_start = min(starts, default=None)
+            # Any ongoing project keeps the employer open-ended.
+            emp_end = None if None in ends else max(ends)
+            end_for_duration = emp_end or today
+            if emp_start:
+                span_starts.append(emp_start)
+            span_ends.append(max(pe or today for pe in ends))
+            total_projects += len(projects)
+            sort_start = emp_start or end_for_duration
+
+            # Unique skill names in first-seen order.
+            keywords = list(dict.fromkeys(
+                s.get('name') for p in projects for s in (p.get('skills') or []) if s.get('name')
+            ))
 
             roles = emp.get('roles') or []
             role_title = None
@@ -203,13 +410,6 @@ class Renderer(backend.BaseRenderer):
                     role_title = rt
                     break
 
-            keywords: list[str] = []
-            for p in projects:
-                for s in (p.get('skills') or []):
-                    nm = s.get('name')
-                    if nm and nm not in keywords:
-                        keywords.append(nm)
-
             experience.append({
                 'employer': tr(emp.get('name')),
                 'location': tr(emp.get('location')),
@@ -220,14 +420,14 @@ class Renderer(backend.BaseRenderer):
                 'duration_months': _months_between(emp_start, end_for_duration),
                 'keywords': keywords or None,
                 'projects': projects,
+                '_sort': (-end_for_duration.year, -end_for_duration.month, -sort_start.year, -sort_start.month),
             })
 
-        def _sort_key(e: dict) -> tuple[int, int, int, int]:
-            end_d = _parse_date(e.get('end')) or today
-            start_d = _parse_date(e.get('start')) or end_d
-            return (-end_d.year, -end_d.month, -start_d.year, -start_d.month)
-
-        experience.sort(key=_sort_key)
+        experience.sort(key=lambda e: e['_sort'])
+        for e in experience:
+            del e['_sort']
+            for p in e['projects']:
+                del p['_ps'], p['_pe']
 
         # Education.
         education_raw: dict[str, dict] = raw.get('education') or {}
@@ -265,7 +465,7 @@ class Renderer(backend.BaseRenderer):
                 'title': tr(r.get('title')),
                 'relation': tr(r.get('relation')),
                 'text': tr(r.get('text')),
-                'contact': dict(r.get('contact') or {}),
+                'contact': r.get('contact') or {},
             })
 
         # Annotate each skill item with usage data.
@@ -283,20 +483,9 @@ class Renderer(backend.BaseRenderer):
                 it['first_used'] = first_used
                 it['last_used'] = last_used
 
-        # Metrics
-        earliest_start: datetime.date | None = None
-        latest_end_for_duration: datetime.date | None = None
-        total_projects = 0
-        for e in experience:
-            for p in (e.get('projects') or []):
-                total_projects += 1
-                ps = _parse_date(p.get('start'))
-                pe = _parse_date(p.get('end'))
-                if ps and (earliest_start is None or ps < earliest_start):
-                    earliest_start = ps
-                pe_span = pe or today
-                if pe_span and (latest_end_for_duration is None or pe_span > latest_end_for_duration):
-                    latest_end_for_duration = pe_span
+        # Metrics (spans collected in the employer pass above).
+        earliest_start = min(span_starts, default=None)
+        latest_end_for_duration = max(span_ends, default=None)
         months_total = _months_between(earliest_start, latest_end_for_duration) or 0
         experience_years = max(int(round(months_total / 12.0)), 0)
 
@@ -304,7 +493,7 @@ class Renderer(backend.BaseRenderer):
             'version': 1,
             'generated_at': today.isoformat(),
             'lang': lang,
-            'locale': _to_locale(lang),
+            'locale': _LOCALES.get(lang, 'en_US'),
             'environment': environment,
             'person': person,
             'highlights': highlights,
@@ -343,8 +532,7 @@ class Renderer(backend.BaseRenderer):
         base_slug = _slugify(basename)
         cfg_hash = getattr(self, 'config_hash', None)
         cfg_hash_short = (str(cfg_hash)[:8]) if cfg_hash else None
-        lang = getattr(self, 'language', None) or 'en'
-        lang_token = str(lang).replace('_', '-').split('-')[0].lower() or 'en'
+        lang_token = self.lang_token(getattr(self, 'language', None))
         today = datetime.date.today()
         if cfg_hash_short:
             stem = f'{base_slug}-{cfg_hash_short}-{lang_token}-{today.year:04d}-{today.month:02d}-{today.day:02d}'
@@ -354,98 +542,36 @@ class Renderer(backend.BaseRenderer):
         output_log = os.path.join(out_dir, stem + '.log')
         output_tex = os.path.join(out_dir, stem + '.tex')
 
-        env = Environment(loader=FileSystemLoader(template_dir), autoescape=False, trim_blocks=True, lstrip_blocks=True)
-
-    # Add a filter to format dates into localized labels like "Oct 2025" (or "окт 2025").
-    # Month names are read from labels.months_short (a 12-item list localized to current language).
-        labels_data = (intermediate.get('labels') or {})
-
-        def _fmt_ym_label(value: typing.Any, l: typing.Any) -> str:
-            if value is None:
-                return ''
-            s = str(value).strip()
-            if not s:
-                return ''
-
-            # Normalize language code to two letters.
-            try:
-                lang2 = str(l or 'en').strip().lower().replace('_', '-').split('-')[0]
-            except Exception:
-                lang2 = 'en'
-
-            # Prefer labels.months_short (already localized to the current language via expand_intermediate)
-            months_list = labels_data.get('months_short')
-            # `YYYY-MM`.
-            m = re.fullmatch(r'\s*(\d{4})-(\d{2})\s*', s)
-            if m:
-                y = int(m.group(1))
-                mm = int(m.group(2))
-                if not (isinstance(months_list, (list, tuple)) and len(months_list) == 12):
-                    return s
-                name = months_list[max(min(mm, 12), 1) - 1]
-                return f'{name} {y}'
-            # `YYYY`
-            m2 = re.fullmatch(r'\s*(\d{4})\s*', s)
-            if m2:
-                return m2.group(1)
-            # Try ISO date.
-            try:
-                d = datetime.date.fromisoformat(s)
-                if not (isinstance(months_list, (list, tuple)) and len(months_list) == 12):
-                    return s
-                name = months_list[d.month - 1]
-                return f'{name} {d.year}'
-            except Exception:
-                return s
-
-        env.filters['fmt_ym'] = _fmt_ym_label
-
-        # Escape LaTeX special characters in plain text (not for content containing LaTeX macros).
-        def _tex_escape(value: typing.Any) -> str:
-            s = '' if value is None else str(value)
-            if not s:
-                return ''
-            # Replace backslash first to avoid creating control sequences
-            s = s.replace('\\', r'\textbackslash{}')
-            # Escape common LaTeX special chars: & % $ # _ { }
-            s = re.sub(r'([&%$#_{}])', r'\\\1', s)
-            # Handle ~ and ^ which are active characters in TeX text mode.
-            s = s.replace('~', r'\textasciitilde{}').replace('^', r'\textasciicircum{}')
-            return s
-
-        env.filters['tex_escape'] = _tex_escape
+        if getattr(self, 'dump_intermediate', False):
+            with open(os.path.join(out_dir, stem + '.json'), 'wb') as f:
+                f.write(_dump_json(intermediate))
 
-        template = env.get_template(os.path.basename(template_file))
-        rendered_tex = template.render(**intermediate)
+        template = self._load_template(template_dir, os.path.basename(template_file))
+        rendered_tex = template.render(**_attr_tree(intermediate))
 
         # Save the rendered TeX always (helps when build/ has no artifacts yet).
         with open(output_tex, 'w', encoding='utf-8') as f:
             f.write(rendered_tex)
 
-        # Files for container.
+        # Files for container: rendered TeX plus the (cached) tarball of template assets.
         files: dict[str, typing.Any] = {'main.tex': rendered_tex}
-        for dirpath, _dirnames, filenames in os.walk(template_dir):
-            for fname in filenames:
-                full = os.path.join(dirpath, fname)
-                rel = os.path.relpath(full, template_dir)
-                if rel.endswith('.j2') or rel == 'main.tex':
-                    continue
-                with open(full, 'rb') as f:
-                    files[rel] = f.read()
+        archive = self._template_archive(template_dir)
 
+        # `latexmk` picks the number of passes from its dependency database (`main.fdb_latexmk`, kept in the
+        # persistent workspace), so an unchanged document is not recompiled at all.
         shell_script = (
             'set -u; status=0; : > build.log; '
-            '{ echo "== env =="; pwd; ls -la; which pdflatex || true; pdflatex --version || true; } >> build.log 2>&1; '
-            'echo "== first run ==" >> build.log; '
-            'pdflatex -interaction=nonstopmode -halt-on-error main.tex >> build.log 2>&1 || status=$?; '
-            'echo "== second run ==" >> build.log; '
-            'pdflatex -interaction=nonstopmode -halt-on-error main.tex >> build.log 2>&1 || status=$?; '
+            '{ echo "== env =="; pwd; ls -la; which latexmk pdflatex || true; '
+            'latexmk --version || true; pdflatex --version || true; } >> build.log 2>&1; '
+            'echo "== latexmk ==" >> build.log; '
+            'latexmk -pdf -interaction=nonstopmode -halt-on-error main.tex >> build.log 2>&1 || status=$?; '
             'echo ${status} > exit.code'
         )
         cmd = ['sh', '-lc', shell_script]
         outputs = ['main.pdf', 'build.log', 'main.log', 'exit.code']
 
-        result = self.run_in_docker(cmd=cmd, files=files, outputs=outputs)
+        # Each language gets its own working dir: parallel renders don't collide and keep their own `.aux`.
+        result = self.run_in_docker(cmd=cmd, files=files, outputs=outputs, archive=archive, workdir=_slugify(lang_token))
         outputs_map: dict[str, bytes] = result.get('outputs') or {}
 
         # Prefer `exit.code` from container; if missing/invalid, fall back to docker returncode.
@@ -505,7 +631,8 @@ class Renderer(backend.BaseRenderer):
             _write_bytes(output_log, '\n'.join(diag) + '\n')
 
         pdf_bytes = outputs_map.get('main.pdf')
-        if pdf_bytes:
+        # The workspace persists between renders, so `main.pdf` may be left over from an earlier successful run.
+        if pdf_bytes and exit_code == 0:
             with open(output_pdf, 'wb') as f:
                 f.write(pdf_bytes if isinstance(pdf_bytes, (bytes, bytearray)) else bytes(pdf_bytes))
 